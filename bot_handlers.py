@@ -5,11 +5,73 @@ Contains all the message handlers and bot logic.
 
 import logging
 import random
+import functools
+import queue
+import threading
+import time
 from datetime import datetime
 from config import Config
+from rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# How many random responses to draw per batch; one random.choices call
+# amortizes the RNG work across this many regular messages.
+_RESPONSE_BATCH_SIZE = 256
+
+# Owner notification batching: after the first pending notification the
+# worker waits up to this long for more to arrive, then sends them as one
+# message (bounded so a batch stays well under Telegram's 4096-char cap).
+_NOTIFY_BATCH_WINDOW = 1.0
+_NOTIFY_BATCH_MAX = 10
+_NOTIFY_MAX_CHARS = 3500
+_NOTIFY_SEPARATOR = '\n\n———\n\n'
+
+
+@functools.lru_cache(maxsize=128)
+def _format_timestamp(message_date) -> str:
+    """Format a Telegram unix timestamp, caching per-second results.
+
+    Messages arriving within the same second share a timestamp, so bursts
+    of key-phrase hits reuse one formatted string instead of paying
+    fromtimestamp + strftime each time.
+    """
+    return datetime.fromtimestamp(message_date).strftime(
+        '%Y-%m-%d %H:%M:%S UTC')
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_user_fields(first_name, last_name, username) -> tuple:
+    """Build the (full name, display username) pair for a user.
+
+    Repeat senders trigger this with identical inputs, so a bounded cache
+    turns the per-notification string assembly into one dict lookup.
+    """
+    full_name = f"{first_name} {last_name or ''}".strip()
+    return full_name, username if username else "No username"
+
+
+def _handler_errors(error_text: str):
+    """Decorator that logs handler failures and sends a fallback reply.
+
+    Replaces the per-handler try/except blocks so the happy path runs
+    without setting up its own exception handling in every method.
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(self, message, *args, **kwargs):
+            try:
+                return func(self, message, *args, **kwargs)
+            except Exception as e:
+                logger.error("Error in %s: %s", func.__name__, e)
+                self._send_error_message(message, error_text)
+
+        return wrapper
+
+    return decorator
+
 
 class BotHandlers:
     """Class containing all bot message handlers."""
@@ -18,135 +80,181 @@ class BotHandlers:
         """Initialize handlers with configuration and bot instance."""
         self.config = config
         self.bot = bot
+        self.rate_limiter = RateLimiter()
+        # Config is immutable after construction, so bind the hot-path
+        # fields once instead of going through self.config on every message.
+        self._normalize = config._normalize
+        self._contains_key_phrase = config._contains_key_phrase
+        self._key_response = config.KEY_RESPONSE
+        self._other_responses = config.OTHER_RESPONSES
+        self._owner_id = config.OWNER_ID
+        self._notification_template = config.OWNER_NOTIFICATION_TEMPLATE
+        # Owner notifications run on their own thread so the user's reply
+        # never waits behind the extra send_message round-trip; the worker
+        # batches bursts of notifications into a single message.
+        self._notify_queue: queue.Queue = queue.Queue()
+        self._notify_thread = threading.Thread(target=self._notify_worker,
+                                               name='owner-notify',
+                                               daemon=True)
+        self._notify_thread.start()
+        self._response_batch: list = []
+        self._response_batch_lock = threading.Lock()
         logger.info("Bot handlers initialized")
 
+    def _next_random_response(self) -> str:
+        """Pop the next response from a pre-drawn random batch."""
+        with self._response_batch_lock:
+            if not self._response_batch:
+                self._response_batch = random.choices(
+                    self._other_responses, k=_RESPONSE_BATCH_SIZE)
+            return self._response_batch.pop()
+
+    def _reply_to(self, message, text, **kwargs):
+        """Reply to a message, respecting the outbound rate limit."""
+        self.rate_limiter.acquire()
+        return self.bot.reply_to(message, text, **kwargs)
+
+    @_handler_errors("Sorry, something went wrong.")
     def start_command(self, message):
         """Handle /start command."""
-        try:
-            user = message.from_user
-            welcome_message = (f"Привет {user.first_name}!\n\n"
-                               "Что ты тут забыл?\n\n")
-            self.bot.reply_to(message, welcome_message)
-            logger.info(
-                f"Start command used by user {user.id} (@{user.username})")
-        except Exception as e:
-            logger.error(f"Error in start command: {e}")
-            self._send_error_message(message, "Sorry, something went wrong.")
+        user = message.from_user
+        welcome_message = (f"Привет {user.first_name}!\n\n"
+                           "Что ты тут забыл?\n\n")
+        self._reply_to(message, welcome_message)
+        logger.debug(
+            "Start command used by user %s (@%s)", user.id, user.username)
 
+    @_handler_errors("Sorry, something went wrong.")
     def help_command(self, message):
         """Handle /help command."""
-        try:
-            help_message = ("🤖 *Bot Help*\n\n"
-                            "Available commands:\n"
-                            "• /start - Start the bot\n"
-                            "• /help - Show this help message\n\n"
-                            "Just send me any message and I'll respond! 💬")
-            self.bot.reply_to(message, help_message, parse_mode='Markdown')
-            logger.info(f"Help command used by user {message.from_user.id}")
-        except Exception as e:
-            logger.error(f"Error in help command: {e}")
-            self._send_error_message(message, "Sorry, something went wrong.")
+        help_message = ("🤖 *Bot Help*\n\n"
+                        "Available commands:\n"
+                        "• /start - Start the bot\n"
+                        "• /help - Show this help message\n\n"
+                        "Just send me any message and I'll respond! 💬")
+        self._reply_to(message, help_message, parse_mode='Markdown')
+        logger.debug("Help command used by user %s", message.from_user.id)
 
+    @_handler_errors("Sorry, I couldn't process your message.")
     def handle_message(self, message):
         """Handle all text messages."""
-        try:
-            if not message.text:
-                logger.warning("Received message without text")
-                return
+        if not message.text:
+            logger.warning("Received message without text")
+            return
 
-            user = message.from_user
-            message_text = message.text.strip()
+        user = message.from_user
+        # Telegram already strips surrounding whitespace from message text,
+        # so avoid re-stripping (and re-allocating) it per message; a
+        # whitespace-only payload is still rejected without a copy.
+        message_text = message.text
 
-            if not message_text:
-                logger.info(f"Received empty message from user {user.id}")
-                return
+        if message_text.isspace():
+            logger.debug("Received empty message from user %s", user.id)
+            return
 
-            logger.info(
-                f"Received message from {user.id} (@{user.username}): '{message_text}'"
-            )
+        logger.debug("Received message from %s (@%s): '%s'", user.id,
+                     user.username, message_text)
 
-            # Check if message contains key phrase
-            normalized_message = self.config.normalize_text(message_text)
-            key_phrase = self.config.get_effective_key_phrase()
-
-            if key_phrase in normalized_message:
-                self._handle_key_phrase(message, user, message_text)
-            else:
-                self._handle_regular_message(message, user, message_text)
-
-        except Exception as e:
-            logger.error(f"Error handling message: {e}")
-            self._send_error_message(
-                message, "Sorry, I couldn't process your message.")
+        # Check if message contains key phrase
+        if self._contains_key_phrase(self._normalize(message_text)):
+            self._handle_key_phrase(message, user, message_text)
+        else:
+            self._handle_regular_message(message, user, message_text)
 
     def _handle_key_phrase(self, message, user, message_text: str):
         """Handle messages containing the key phrase."""
-        try:
-            # Send the predefined response to the user
-            self.bot.reply_to(message, self.config.KEY_RESPONSE)
-            logger.info(
-                f"Key phrase detected from user {user.id}, sent key response")
-
-            # Notify the owner if configured
-            if self.config.OWNER_ID:
-                self._notify_owner(user, message_text, message.date)
-            else:
-                logger.warning(
-                    "Owner notification skipped: OWNER_ID not configured")
+        # Send the predefined response to the user
+        self._reply_to(message, self._key_response)
+        logger.info(
+            "Key phrase detected from user %s, sent key response", user.id)
 
-        except Exception as e:
-            logger.error(f"Error handling key phrase: {e}")
-            raise
+        # Notify the owner if configured (in the background, off the
+        # reply hot path; the notify worker logs its own failures)
+        if self._owner_id:
+            self._notify_queue.put((user, message_text, message.date))
+        else:
+            logger.warning(
+                "Owner notification skipped: OWNER_ID not configured")
 
     def _handle_regular_message(self, message, user, message_text: str):
         """Handle regular messages (not containing key phrase)."""
-        try:
-            # Choose a random response from the list
-            if self.config.OTHER_RESPONSES:
-                response = random.choice(self.config.OTHER_RESPONSES)
-                self.bot.reply_to(message, response)
-                logger.info(f"Sent random response to user {user.id}")
-            else:
-                logger.warning("No other responses configured")
-                self.bot.reply_to(message, "Thanks for your message!")
+        # Choose a random response from the list
+        if self._other_responses:
+            response = self._next_random_response()
+            self._reply_to(message, response)
+            logger.debug("Sent random response to user %s", user.id)
+        else:
+            logger.warning("No other responses configured")
+            self._reply_to(message, "Thanks for your message!")
 
-        except Exception as e:
-            logger.error(f"Error handling regular message: {e}")
-            raise
+    def _format_notification(self, user, message_text: str,
+                             message_date) -> str:
+        """Format one owner notification from the preset template."""
+        user_full_name, username = _format_user_fields(user.first_name,
+                                                       user.last_name,
+                                                       user.username)
+
+        # Format the timestamp
+        time_str = _format_timestamp(message_date) if message_date else "Unknown"
 
-    def _notify_owner(self, user, message_text: str, message_date):
-        """Send notification to the bot owner."""
+        return self._notification_template.format(
+            user_full_name=user_full_name,
+            user_id=user.id,
+            username=username,
+            message_text=message_text,
+            time_str=time_str)
+
+    def _notify_worker(self):
+        """Drain the notification queue, batching bursts into one send.
+
+        Blocks on the first pending notification, then collects whatever
+        else arrives within the batch window so a burst of key-phrase hits
+        costs one send_message against the rate limit instead of one each.
+        """
+        while True:
+            items = [self._notify_queue.get()]
+            deadline = time.monotonic() + _NOTIFY_BATCH_WINDOW
+            while len(items) < _NOTIFY_BATCH_MAX:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._notify_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._send_notification_batch(items)
+
+    def _send_notification_batch(self, items):
+        """Send queued notifications to the owner, chunked by message size."""
         try:
-            username = user.username if user.username else "No username"
-            user_full_name = f"{user.first_name} {user.last_name or ''}".strip(
-            )
-
-            # Format the timestamp
-            if message_date:
-                time_str = datetime.fromtimestamp(message_date).strftime(
-                    '%Y-%m-%d %H:%M:%S UTC')
-            else:
-                time_str = "Unknown"
-
-            notification_message = ("🔔 *Key Phrase Detected!*\n\n"
-                                    f"👤 *User:* {user_full_name}\n"
-                                    f"🆔 *User ID:* `{user.id}`\n"
-                                    f"📝 *Username:* @{username}\n"
-                                    f"💬 *Message:* {message_text}\n\n"
-                                    f"🕐 *Time:* {time_str}")
-
-            self.bot.send_message(chat_id=self.config.OWNER_ID,
-                                  text=notification_message,
-                                  parse_mode='Markdown')
-            logger.info(f"Owner notification sent for user {user.id}")
+            texts = [self._format_notification(*item) for item in items]
+            chunk: list = []
+            chunk_len = 0
+            for text in texts:
+                if chunk and chunk_len + len(text) > _NOTIFY_MAX_CHARS:
+                    self._send_to_owner(_NOTIFY_SEPARATOR.join(chunk))
+                    chunk, chunk_len = [], 0
+                chunk.append(text)
+                chunk_len += len(text) + len(_NOTIFY_SEPARATOR)
+            if chunk:
+                self._send_to_owner(_NOTIFY_SEPARATOR.join(chunk))
+            logger.info("Owner notification sent for %s message(s)",
+                        len(items))
 
         except Exception as e:
-            logger.error(f"Failed to send owner notification: {e}")
-            # Don't raise here as the main message was already sent
+            logger.error("Failed to send owner notification: %s", e)
+            # Don't raise here as the main messages were already sent
+
+    def _send_to_owner(self, text: str):
+        """Send a single message to the owner, respecting the rate limit."""
+        self.rate_limiter.acquire()
+        self.bot.send_message(chat_id=self._owner_id,
+                              text=text,
+                              parse_mode='Markdown')
 
     def _send_error_message(self, message, error_text: str):
         """Send an error message to the user."""
         try:
-            self.bot.reply_to(message, error_text)
+            self._reply_to(message, error_text)
         except Exception as e:
-            logger.error(f"Failed to send error message: {e}")
+            logger.error("Failed to send error message: %s", e)
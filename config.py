@@ -4,16 +4,53 @@ Handles environment variables and configuration validation.
 """
 
 import os
+import re
+import sys
 import json
 import logging
+import functools
 from typing import List, Optional
 from dotenv import load_dotenv
 
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Bot traffic is highly repetitive ("/start", "ok", button labels), so cache
+# lowercased results for short messages instead of re-running str.lower on
+# every repeat. Long messages are rarely repeated and would bloat the cache,
+# so they bypass it.
+_NORMALIZE_CACHE_MAX_LEN = 512
+
+
+@functools.lru_cache(maxsize=4096)
+def _lower_cached(text: str) -> str:
+    return text.lower()
+
+
+def _normalize_lower(text: str) -> str:
+    if len(text) > _NORMALIZE_CACHE_MAX_LEN:
+        return text.lower()
+    return _lower_cached(text)
+
 
 class Config:
-    """Configuration class that loads settings from environment variables."""
+    """Configuration class that loads settings from environment variables.
+
+    Uses __slots__: the instance is read on every message, and slots give
+    fixed-offset attribute access without a per-instance __dict__ (while
+    also catching typo'd assignments).
+    """
+
+    __slots__ = ('BOT_TOKEN', 'OWNER_ID', 'KEY_PHRASES', 'KEY_PHRASE',
+                 'KEY_RESPONSE', 'OTHER_RESPONSES', 'CASE_SENSITIVE',
+                 'MATCH_WORD_BOUNDARY', 'NUM_THREADS', 'LOG_LEVEL',
+                 'OWNER_NOTIFICATION_TEMPLATE', '_effective_key_phrases',
+                 '_effective_key_phrase', '_normalize',
+                 '_contains_key_phrase')
 
     def __init__(self):
         """Initialize configuration by loading environment variables."""
@@ -32,8 +69,10 @@ class Config:
             except ValueError:
                 logger.error(f"Invalid OWNER_ID format: {owner_id_str}")
 
-        # Key phrase configuration
-        self.KEY_PHRASE: str = os.getenv('KEY_PHRASE', 'QR код')
+        # Key phrase configuration (a single phrase or a JSON array of them)
+        key_phrase_str = os.getenv('KEY_PHRASE', 'QR код')
+        self.KEY_PHRASES: List[str] = self._parse_key_phrases(key_phrase_str)
+        self.KEY_PHRASE: str = self.KEY_PHRASES[0] if self.KEY_PHRASES else ''
         self.KEY_RESPONSE: str = os.getenv(
             'KEY_RESPONSE',
             'Это то, о чём я говорил! Ура! Ты прошел мой МЕГА квест! Поздравляю! Теперь ты можешь получить свой приз!'
@@ -47,6 +86,17 @@ class Config:
         # Bot behavior configuration
         self.CASE_SENSITIVE: bool = os.getenv('CASE_SENSITIVE',
                                               'false').lower() == 'true'
+        self.MATCH_WORD_BOUNDARY: bool = os.getenv('MATCH_WORD_BOUNDARY',
+                                                   'false').lower() == 'true'
+
+        # Worker pool configuration (defaults to Telegram's 30 msg/s limit)
+        num_threads_str = os.getenv('NUM_THREADS', '')
+        self.NUM_THREADS: int = 30
+        if num_threads_str:
+            try:
+                self.NUM_THREADS = max(1, int(num_threads_str))
+            except ValueError:
+                logger.error(f"Invalid NUM_THREADS format: {num_threads_str}")
 
         # Logging configuration
         log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -57,8 +107,87 @@ class Config:
         # Validate configuration
         self._validate_config()
 
+        # Intern the canned replies: each one is handed to the bot API and
+        # logging machinery thousands of times, and interning guarantees a
+        # single shared object with cheap identity-based comparisons.
+        self.KEY_RESPONSE = sys.intern(self.KEY_RESPONSE)
+        self.OTHER_RESPONSES = [sys.intern(r) for r in self.OTHER_RESPONSES]
+
+        # Precompute comparison helpers so the per-message hot path does not
+        # re-lowercase the key phrase or dispatch on CASE_SENSITIVE each time.
+        self._effective_key_phrases: tuple = tuple(
+            phrase if self.CASE_SENSITIVE else phrase.lower()
+            for phrase in self.KEY_PHRASES)
+        self._effective_key_phrase: str = (
+            self._effective_key_phrases[0] if self._effective_key_phrases else '')
+        self._normalize = (lambda text: text) if self.CASE_SENSITIVE else _normalize_lower
+        self._contains_key_phrase = self._build_key_phrase_matcher()
+
+        # Pre-built owner notification template; handlers fill in the
+        # per-message fields with a single .format() call.
+        self.OWNER_NOTIFICATION_TEMPLATE: str = (
+            "🔔 *Key Phrase Detected!*\n\n"
+            "👤 *User:* {user_full_name}\n"
+            "🆔 *User ID:* `{user_id}`\n"
+            "📝 *Username:* @{username}\n"
+            "💬 *Message:* {message_text}\n\n"
+            "🕐 *Time:* {time_str}")
+
         logger.info("Configuration initialized successfully")
 
+    def _parse_key_phrases(self, key_phrase_str: str) -> List[str]:
+        """Parse KEY_PHRASE as a JSON array of phrases or a single phrase."""
+        if key_phrase_str.lstrip().startswith('['):
+            try:
+                phrases = json.loads(key_phrase_str)
+                if isinstance(phrases, list) and all(
+                        isinstance(p, str) for p in phrases):
+                    return [p for p in phrases if p]
+                logger.warning(
+                    "KEY_PHRASE is not a valid JSON array of strings")
+            except json.JSONDecodeError:
+                pass
+        return [key_phrase_str] if key_phrase_str else []
+
+    def _build_key_phrase_matcher(self):
+        """Build the fastest available predicate for key phrase detection.
+
+        A single phrase uses the plain `in` substring test. Multiple phrases
+        use a pyahocorasick automaton when available (one linear scan over
+        the message instead of one scan per phrase), falling back to
+        sequential `in` tests otherwise. Messages shorter than the shortest
+        phrase cannot match, so every variant rejects them with a length
+        check before scanning any bytes.
+
+        With MATCH_WORD_BOUNDARY enabled, all phrases are compiled once
+        into a single alternation pattern anchored with \\b on both sides,
+        so "QR код" no longer matches inside "QR кодекс".
+        """
+        phrases = self._effective_key_phrases
+        min_len = min((len(p) for p in phrases), default=0)
+
+        if self.MATCH_WORD_BOUNDARY and phrases:
+            pattern = re.compile('|'.join(
+                r'\b' + re.escape(phrase) + r'\b' for phrase in phrases))
+            search = pattern.search
+            return lambda text: (len(text) >= min_len
+                                 and search(text) is not None)
+
+        if len(phrases) <= 1:
+            phrase = self._effective_key_phrase
+            return lambda text: len(text) >= min_len and phrase in text
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for phrase in phrases:
+                automaton.add_word(phrase, True)
+            automaton.make_automaton()
+            return lambda text: (len(text) >= min_len and next(
+                automaton.iter(text), None) is not None)
+
+        return lambda text: (len(text) >= min_len and any(
+            phrase in text for phrase in phrases))
+
     def _parse_other_responses(self, responses_str: str) -> List[str]:
         """Parse OTHER_RESPONSES from environment variable."""
         if not responses_str:
@@ -68,34 +197,26 @@ class Config:
                 "Что?", "Подумай ещё.", "Не правильно!", "Ты не угадал!"
             ]
 
+        # Priority cascade: JSON array, then comma-separated, then
+        # newline-separated, then single response. Each format is tried
+        # with one pass over the string; the first that yields anything
+        # wins.
         try:
-            # Try to parse as JSON array first
             responses = json.loads(responses_str)
             if isinstance(responses, list) and all(
                     isinstance(r, str) for r in responses):
                 return responses
-            else:
-                logger.warning(
-                    "OTHER_RESPONSES is not a valid JSON array of strings")
+            logger.warning(
+                "OTHER_RESPONSES is not a valid JSON array of strings")
         except json.JSONDecodeError:
-            # If not JSON, try to split by delimiter
             pass
 
-        # Try comma-separated values
-        if ',' in responses_str:
-            responses = [
-                r.strip() for r in responses_str.split(',') if r.strip()
-            ]
-            if responses:
-                return responses
-
-        # Try newline-separated values
-        if '\n' in responses_str:
-            responses = [
-                r.strip() for r in responses_str.split('\n') if r.strip()
-            ]
-            if responses:
-                return responses
+        for delimiter in (',', '\n'):
+            parts = responses_str.split(delimiter)
+            if len(parts) > 1:
+                responses = [r.strip() for r in parts if r.strip()]
+                if responses:
+                    return responses
 
         # If all else fails, treat as single response
         return [responses_str.strip()
@@ -120,6 +241,7 @@ class Config:
         if not self.KEY_PHRASE:
             logger.warning("KEY_PHRASE is empty, using default: 'secret'")
             self.KEY_PHRASE = 'secret'
+            self.KEY_PHRASES = ['secret']
 
         if not self.KEY_RESPONSE:
             logger.warning("KEY_RESPONSE is empty, using default response")
@@ -137,9 +259,8 @@ class Config:
 
     def get_effective_key_phrase(self) -> str:
         """Get the key phrase in the format used for comparison."""
-        return self.KEY_PHRASE if self.CASE_SENSITIVE else self.KEY_PHRASE.lower(
-        )
+        return self._effective_key_phrase
 
     def normalize_text(self, text: str) -> str:
         """Normalize text for comparison based on case sensitivity setting."""
-        return text if self.CASE_SENSITIVE else text.lower()
+        return self._normalize(text)
@@ -21,6 +21,7 @@ def main():
     try:
         # Load configuration
         config = Config()
+        logging.getLogger().setLevel(config.LOG_LEVEL)
         logger.info("Configuration loaded successfully")
         
         # Validate required configuration
@@ -32,8 +33,13 @@ def main():
             logger.error("OWNER_ID is required but not found in environment variables")
             return
         
-        # Create bot instance
-        bot = telebot.TeleBot(config.BOT_TOKEN)
+        # Create bot instance with a worker pool so one slow Telegram API
+        # call (e.g. an owner notification) cannot stall every other chat.
+        # The pool size defaults to Telegram's overall 30 msg/s send limit
+        # and can be tuned via the NUM_THREADS environment variable.
+        bot = telebot.TeleBot(config.BOT_TOKEN,
+                              threaded=True,
+                              num_threads=config.NUM_THREADS)
         logger.info("Bot instance created")
         
         # Initialize handlers
@@ -0,0 +1,36 @@
+"""
+Rate limiter module.
+Smooths outbound Telegram API calls so bursts stay under the global
+30 messages/second limit instead of triggering 429 retry loops.
+"""
+
+import time
+import threading
+
+
+class RateLimiter:
+    """Thread-safe token bucket for outbound message sends."""
+
+    def __init__(self, max_rate: int = 30, time_period: float = 1.0):
+        """Initialize the bucket with `max_rate` sends per `time_period`."""
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a send slot is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._tokens = min(
+                    float(self.max_rate),
+                    self._tokens + elapsed * self.max_rate / self.time_period)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) * self.time_period / self.max_rate
+            time.sleep(wait)